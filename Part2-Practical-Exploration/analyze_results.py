@@ -8,96 +8,276 @@ Processes gem5 simulation statistics and generates comparative analysis
 import os
 import re
 import csv
+import mmap
+import itertools
 import json
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-import matplotlib.pyplot as plt
-import pandas as pd
+from typing import Dict, Union
+
+# numpy, pandas and matplotlib are imported where they are used, so --help,
+# argument errors and the stats parser workers skip their start-up cost
+
+# Map gem5 stat names (as raw bytes) to the metric keys used throughout the analysis
+_METRIC_KEYS = {
+    b'sim_seconds': 'sim_seconds',
+    b'sim_insts': 'sim_insts',
+    b'host_inst_rate': 'host_inst_rate',
+    b'system.cpu.committedInsts': 'committedInsts',
+    b'system.cpu.numCycles': 'numCycles',
+    b'system.cpu.ipc': 'ipc',
+    
+    # Branch prediction metrics
+    b'system.cpu.branchPred.lookups': 'branch_lookups',
+    b'system.cpu.branchPred.condPredicted': 'branch_condPredicted',
+    b'system.cpu.branchPred.condIncorrect': 'branch_condIncorrect',
+    
+    # Cache metrics
+    b'system.cpu.icache.overall_hits::total': 'icache_overall_hits',
+    b'system.cpu.icache.overall_misses::total': 'icache_overall_misses',
+    b'system.cpu.dcache.overall_hits::total': 'dcache_overall_hits',
+    b'system.cpu.dcache.overall_misses::total': 'dcache_overall_misses',
+    b'system.l2cache.overall_hits::total': 'l2cache_overall_hits',
+    b'system.l2cache.overall_misses::total': 'l2cache_overall_misses',
+    
+    # O3CPU specific metrics (for superscalar experiments)
+    b'system.cpu.fetch.rate': 'fetch_rate',
+    b'system.cpu.decode.rate': 'decode_rate',
+    b'system.cpu.rename.rate': 'rename_rate',
+    b'system.cpu.iew.rate': 'iew_rate',
+    b'system.cpu.commit.rate': 'commit_rate',
+    
+    # ROB and queue occupancy
+    b'system.cpu.rob.reads': 'rob_reads',
+    b'system.cpu.rob.writes': 'rob_writes',
+    b'system.cpu.iq.reads': 'iq_reads',
+    b'system.cpu.iq.writes': 'iq_writes',
+}
+
+# One alternation over every tracked stat name, so a single finditer pass over
+# the file extracts all metrics; the trailing whitespace anchors the full name.
+# The shared "system." prefix is factored out so a line is only tried against
+# the per-name branches once its leading literal has matched
+_SYSTEM_PREFIX = b'system.'
+_METRIC_LINE = (
+    rb'(' + re.escape(_SYSTEM_PREFIX) + rb'(?:'
+    + b'|'.join(re.escape(name[len(_SYSTEM_PREFIX):]) for name in _METRIC_KEYS
+                if name.startswith(_SYSTEM_PREFIX))
+    + rb')|'
+    + b'|'.join(re.escape(name) for name in _METRIC_KEYS
+                if not name.startswith(_SYSTEM_PREFIX))
+    + rb')[ \t]+([\d.e+\-]+)')
+
+# Leading with a literal newline lets the regex engine jump from line start to
+# line start instead of testing every byte; the first line is matched on its own
+_METRIC_RE = re.compile(rb'\n' + _METRIC_LINE)
+_FIRST_METRIC_RE = re.compile(_METRIC_LINE)
+
+# Raw counters that the derived metrics are computed from
+_DERIVED_INPUTS = [
+    'branch_condPredicted', 'branch_condIncorrect',
+    'icache_overall_hits', 'icache_overall_misses',
+    'dcache_overall_hits', 'dcache_overall_misses',
+    'l2cache_overall_hits', 'l2cache_overall_misses',
+]
+
+def _to_num(s: bytes, _int=int, _float=float) -> Union[int, float]:
+    """Convert a gem5 stat value to int or float"""
+    # Built-ins are bound as defaults to skip global lookups per value
+    try:
+        return _int(s)
+    except ValueError:
+        return _float(s)
+
+def _parse_stats_bytes(data: Union[bytes, mmap.mmap]) -> Dict[str, Union[int, float]]:
+    """Extract the tracked metrics from the raw contents of a stats.txt file"""
+    # Kept free of pandas/numpy and fully annotated so it runs unchanged
+    # under PyPy or can be compiled on its own with mypyc
+    metrics: Dict[str, Union[int, float]] = {}
+    metric_keys = _METRIC_KEYS
+    first = _FIRST_METRIC_RE.match(data)
+    matches = _METRIC_RE.finditer(data)
+    for match in itertools.chain([first] if first else [], matches):
+        key = metric_keys[match.group(1)]
+        # Keep the first dump's value when stats are dumped repeatedly
+        if key in metrics:
+            continue
+        try:
+            metrics[key] = _to_num(match.group(2))
+        except ValueError:
+            continue
+    
+    return metrics
+
+def _parse_stats_h5(h5_path: str) -> Dict[str, Union[int, float]]:
+    """Read the tracked metrics from a gem5 HDF5 stats file (needs h5py)"""
+    import h5py
+    
+    # Each stat is a dataset at its dotted name with "/" separators, indexed
+    # by dump first; "::total" entries are the sum of a vector stat
+    metrics: Dict[str, Union[int, float]] = {}
+    with h5py.File(h5_path, 'r') as f:
+        for stat, key in _METRIC_KEYS.items():
+            name, _, subname = stat.decode('ascii').partition('::')
+            dataset = f.get(name.replace('.', '/'))
+            if dataset is None or len(dataset) == 0:
+                continue
+            # Keep the first dump's value, as the text parser does
+            value = dataset[0]
+            if subname == 'total':
+                value = value.sum()
+            elif getattr(value, 'ndim', 0):
+                continue
+            metrics[key] = value.item()
+    
+    return metrics
+
+def _parse_stats_text(stats_path: str) -> Dict[str, Union[int, float]]:
+    """Extract the tracked metrics from a gem5 stats.txt file"""
+    # Single pass over the memory-mapped file: each stat line is
+    # "<name> <value> # <desc>"
+    try:
+        f = open(stats_path, 'rb')
+    except FileNotFoundError:
+        print(f"Warning: Stats file not found: {stats_path}")
+        return {}
+    with f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty stats file (simulation aborted before the first dump)
+            return {}
+    try:
+        return _parse_stats_bytes(mm)
+    finally:
+        mm.close()
+
+def parse_stats_file(stats_path: str) -> Dict[str, Union[int, float]]:
+    """Parse gem5 stats.txt file and extract key metrics"""
+    # Prefer the binary stats.h5 written next to stats.txt: it skips text
+    # tokenizing and number parsing entirely
+    h5_path = os.path.join(os.path.dirname(stats_path), 'stats.h5')
+    if not os.path.exists(h5_path):
+        return _parse_stats_text(stats_path)
+    
+    try:
+        metrics = _parse_stats_h5(h5_path)
+    except (ImportError, OSError, KeyError, TypeError, ValueError):
+        # No h5py, or a truncated/corrupt file (e.g. from a killed run) or an
+        # unexpected layout; stats.txt holds the same values
+        return _parse_stats_text(stats_path)
+    
+    # A metric missing from the h5 file may still be in stats.txt; keep
+    # whichever source reports more of them
+    if len(metrics) < len(_METRIC_KEYS) and os.path.exists(stats_path):
+        text_metrics = _parse_stats_text(stats_path)
+        if len(text_metrics) > len(metrics):
+            return text_metrics
+    return metrics
+
+def parse_stats_files(stats_paths):
+    """Parse several stats.txt files, in parallel when there is more than one"""
+    stats_paths = list(stats_paths)
+    workers = os.cpu_count() or 1
+    if len(stats_paths) < 2 or workers < 2:
+        return [parse_stats_file(path) for path in stats_paths]
+    
+    # Each file is independent and the results are small dicts, so one
+    # process per core keeps the parse off a single GIL
+    chunksize = max(1, len(stats_paths) // (4 * workers))
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(parse_stats_file, stats_paths, chunksize=chunksize))
+
+def add_derived_metrics(df):
+    """Add branch accuracy and cache hit rates as vectorized columns"""
+    import numpy as np
+    
+    # Stats absent from a run stay NaN; a ratio is only derived when both of
+    # its counters were reported, and is 0 otherwise, as in the summaries
+    counters = df.reindex(columns=_DERIVED_INPUTS)
+    
+    def ratio(column, value, denominator, present):
+        # With no run reporting the counters the summaries held integer 0s
+        df[column] = np.where(present & (denominator > 0), value, 0.0) if present.any() else 0
+    
+    predicted = counters['branch_condPredicted']
+    incorrect = counters['branch_condIncorrect']
+    ratio('branch_accuracy', 1.0 - incorrect / predicted, predicted,
+          predicted.notna() & incorrect.notna())
+    
+    # Cache hit rates
+    for cache in ['icache', 'dcache', 'l2cache']:
+        hits = counters[f'{cache}_overall_hits']
+        misses = counters[f'{cache}_overall_misses']
+        total_accesses = hits + misses
+        ratio(f'{cache}_hit_rate', hits / total_accesses, total_accesses,
+              hits.notna() & misses.notna())
+    
+    return df
+
+def _arrow_csv_table(df, pa, pc):
+    """Arrow table that writes exactly like df.to_csv(float_format='%.6f'), or None"""
+    import numpy as np
+    
+    columns = {}
+    for name in df.columns:
+        values = pa.array(df[name], from_pandas=True)
+        if pa.types.is_floating(values.type):
+            floats = df[name].to_numpy(dtype='float64')
+            floats = floats[~np.isnan(floats)]
+            # '%.6f' prints inf and keeps the sign of values that round to
+            # -0.000000, and pandas writes an all-NaN column differently;
+            # Arrow's decimals can do none of that, so leave those to pandas
+            if (floats.size == 0 or not np.isfinite(floats).all()
+                    or (np.signbit(floats) & (np.abs(floats) < 1e-6)).any()):
+                return None
+            # A 6-place decimal prints like '%.6f'; the safe cast raises
+            # ArrowInvalid rather than wrapping values too large to hold
+            values = pc.cast(values, pa.decimal128(38, 6))
+        elif not (pa.types.is_integer(values.type) or pa.types.is_string(values.type)
+                  or pa.types.is_large_string(values.type)):
+            # e.g. booleans, which pandas prints as True/False
+            return None
+        columns[name] = values
+    return pa.table(columns)
+
+def write_csv(df, csv_path):
+    """Write a results frame to CSV, formatting floats in C when pyarrow is available"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pacsv
+    except ImportError:
+        df.to_csv(csv_path, index=False, float_format='%.6f')
+        return
+    
+    # Arrow is only used when it produces the same bytes as the pandas
+    # writer; nothing is quoted, and NaN stays an empty cell
+    options = pacsv.WriteOptions(include_header=False, quoting_style='none')
+    try:
+        table = _arrow_csv_table(df, pa, pc)
+        if table is not None:
+            # Arrow quotes the header whatever the quoting style, so write it here
+            with open(csv_path, 'wb') as f:
+                f.write((','.join(df.columns) + '\n').encode())
+                pacsv.write_csv(table, f, write_options=options)
+            return
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # An out-of-range float, a mixed-type column, or a value that needs
+        # quoting (e.g. contains a comma)
+        pass
+    df.to_csv(csv_path, index=False, float_format='%.6f')
 
 class Gem5ResultsAnalyzer:
     def __init__(self, results_base_dir):
         self.results_base_dir = Path(results_base_dir)
         self.experiments = {}
+        self._ipc_pivot = None
         
     def parse_stats_file(self, stats_path):
         """Parse gem5 stats.txt file and extract key metrics"""
-        metrics = {}
-        
-        if not os.path.exists(stats_path):
-            print(f"Warning: Stats file not found: {stats_path}")
-            return metrics
-            
-        with open(stats_path, 'r') as f:
-            content = f.read()
-            
-        # Define patterns for key metrics
-        patterns = {
-            'sim_seconds': r'sim_seconds\s+([\d\.e\-\+]+)',
-            'sim_insts': r'sim_insts\s+(\d+)',
-            'host_inst_rate': r'host_inst_rate\s+([\d\.e\-\+]+)',
-            'committedInsts': r'system\.cpu\.committedInsts\s+(\d+)',
-            'numCycles': r'system\.cpu\.numCycles\s+(\d+)',
-            'ipc': r'system\.cpu\.ipc\s+([\d\.e\-\+]+)',
-            
-            # Branch prediction metrics
-            'branch_lookups': r'system\.cpu\.branchPred\.lookups\s+(\d+)',
-            'branch_condPredicted': r'system\.cpu\.branchPred\.condPredicted\s+(\d+)',
-            'branch_condIncorrect': r'system\.cpu\.branchPred\.condIncorrect\s+(\d+)',
-            
-            # Cache metrics
-            'icache_overall_hits': r'system\.cpu\.icache\.overall_hits::total\s+(\d+)',
-            'icache_overall_misses': r'system\.cpu\.icache\.overall_misses::total\s+(\d+)',
-            'dcache_overall_hits': r'system\.cpu\.dcache\.overall_hits::total\s+(\d+)',
-            'dcache_overall_misses': r'system\.cpu\.dcache\.overall_misses::total\s+(\d+)',
-            'l2cache_overall_hits': r'system\.l2cache\.overall_hits::total\s+(\d+)',
-            'l2cache_overall_misses': r'system\.l2cache\.overall_misses::total\s+(\d+)',
-            
-            # O3CPU specific metrics (for superscalar experiments)
-            'fetch_rate': r'system\.cpu\.fetch\.rate\s+([\d\.e\-\+]+)',
-            'decode_rate': r'system\.cpu\.decode\.rate\s+([\d\.e\-\+]+)',
-            'rename_rate': r'system\.cpu\.rename\.rate\s+([\d\.e\-\+]+)',
-            'iew_rate': r'system\.cpu\.iew\.rate\s+([\d\.e\-\+]+)',
-            'commit_rate': r'system\.cpu\.commit\.rate\s+([\d\.e\-\+]+)',
-            
-            # ROB and queue occupancy
-            'rob_reads': r'system\.cpu\.rob\.reads\s+(\d+)',
-            'rob_writes': r'system\.cpu\.rob\.writes\s+(\d+)',
-            'iq_reads': r'system\.cpu\.iq\.reads\s+(\d+)',
-            'iq_writes': r'system\.cpu\.iq\.writes\s+(\d+)',
-        }
-        
-        for metric, pattern in patterns.items():
-            match = re.search(pattern, content)
-            if match:
-                try:
-                    # Try to convert to appropriate numeric type
-                    value = match.group(1)
-                    if '.' in value or 'e' in value.lower():
-                        metrics[metric] = float(value)
-                    else:
-                        metrics[metric] = int(value)
-                except ValueError:
-                    metrics[metric] = value
-        
-        # Calculate derived metrics
-        if 'branch_condPredicted' in metrics and 'branch_condIncorrect' in metrics:
-            if metrics['branch_condPredicted'] > 0:
-                metrics['branch_accuracy'] = 1.0 - (metrics['branch_condIncorrect'] / metrics['branch_condPredicted'])
-            else:
-                metrics['branch_accuracy'] = 0.0
-                
-        # Cache hit rates
-        for cache in ['icache', 'dcache', 'l2cache']:
-            hits_key = f'{cache}_overall_hits'
-            misses_key = f'{cache}_overall_misses'
-            if hits_key in metrics and misses_key in metrics:
-                total_accesses = metrics[hits_key] + metrics[misses_key]
-                if total_accesses > 0:
-                    metrics[f'{cache}_hit_rate'] = metrics[hits_key] / total_accesses
-                else:
-                    metrics[f'{cache}_hit_rate'] = 0.0
-        
-        return metrics
+        return parse_stats_file(stats_path)
     
     def load_experiment_results(self):
         """Load results from all experiment directories"""
@@ -108,60 +288,101 @@ class Gem5ResultsAnalyzer:
             'smt'  # If implemented
         ]
         
+        # Gather workloads from every experiment first so all stats files
+        # are parsed in a single parallel batch
+        workloads = []
         for exp_dir in experiment_dirs:
             exp_path = self.results_base_dir / exp_dir
             if exp_path.exists():
-                self.experiments[exp_dir] = self.load_experiment_data(exp_path)
+                self.experiments[exp_dir] = {}
+                for workload_name, stats_file, config_path in self.list_workloads(exp_path):
+                    workloads.append((exp_dir, workload_name, stats_file, config_path))
+        
+        all_stats = parse_stats_files(stats_file for _, _, stats_file, _ in workloads)
+        for (exp_dir, workload_name, _, config_path), stats in zip(workloads, all_stats):
+            self.experiments[exp_dir][workload_name] = {
+                'stats': stats,
+                'config_path': config_path
+            }
+    
+    def list_workloads(self, exp_path):
+        """List (workload_name, stats_path, config_path) for an experiment"""
+        workloads = []
+        
+        # DirEntry caches the file type from the directory listing, so only
+        # config.ini needs an extra stat; a missing stats.txt is reported
+        # when parse_stats_file fails to open it
+        with os.scandir(exp_path) as entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                stats_path = os.path.join(entry.path, 'stats.txt')
+                config_path = os.path.join(entry.path, 'config.ini')
+                workloads.append((
+                    entry.name,
+                    stats_path,
+                    config_path if os.path.exists(config_path) else None
+                ))
+        
+        return workloads
     
     def load_experiment_data(self, exp_path):
         """Load data for a specific experiment"""
         experiment_data = {}
         
-        for workload_dir in exp_path.iterdir():
-            if workload_dir.is_dir():
-                stats_file = workload_dir / 'stats.txt'
-                config_file = workload_dir / 'config.ini'
-                
-                workload_name = workload_dir.name
-                experiment_data[workload_name] = {
-                    'stats': self.parse_stats_file(stats_file),
-                    'config_path': str(config_file) if config_file.exists() else None
-                }
+        workloads = self.list_workloads(exp_path)
+        all_stats = parse_stats_files(stats_file for _, stats_file, _ in workloads)
+        for (workload_name, _, config_path), stats in zip(workloads, all_stats):
+            experiment_data[workload_name] = {
+                'stats': stats,
+                'config_path': config_path
+            }
         
         return experiment_data
     
     def generate_performance_comparison(self):
         """Generate performance comparison across all experiments"""
+        import pandas as pd
+        
         print("\n=== Performance Comparison Analysis ===")
         
-        # Create comparison table
-        comparison_data = []
+        # Create comparison table column by column, so pandas receives one
+        # list per column instead of inferring columns from row dicts
+        # Missing counters are recorded as NaN rather than 0, so that
+        # add_derived_metrics can tell an absent stat from a zero count
+        stat_columns = ['ipc', 'sim_seconds', 'committedInsts']
+        columns = {name: [] for name in ['experiment', 'workload'] + stat_columns + _DERIVED_INPUTS}
         
         for exp_name, exp_data in self.experiments.items():
             for workload, data in exp_data.items():
                 stats = data['stats']
-                row = {
-                    'experiment': exp_name,
-                    'workload': workload,
-                    'ipc': stats.get('ipc', 0),
-                    'sim_seconds': stats.get('sim_seconds', 0),
-                    'committedInsts': stats.get('committedInsts', 0),
-                    'branch_accuracy': stats.get('branch_accuracy', 0),
-                    'dcache_hit_rate': stats.get('dcache_hit_rate', 0),
-                    'l2cache_hit_rate': stats.get('l2cache_hit_rate', 0)
-                }
-                comparison_data.append(row)
+                columns['experiment'].append(exp_name)
+                columns['workload'].append(workload)
+                for name in stat_columns:
+                    columns[name].append(stats.get(name, 0))
+                for name in _DERIVED_INPUTS:
+                    columns[name].append(stats.get(name, float('nan')))
         
         # Convert to DataFrame for easier analysis
-        df = pd.DataFrame(comparison_data)
+        df = pd.DataFrame(columns)
         
         if not df.empty:
+            # Derive ratios for all runs at once, then keep the summary columns
+            df = add_derived_metrics(df)[[
+                'experiment', 'workload', 'ipc', 'sim_seconds', 'committedInsts',
+                'branch_accuracy', 'dcache_hit_rate', 'l2cache_hit_rate'
+            ]]
+            
+            # Experiment x workload IPC grid, reused for the summary averages
+            self._ipc_pivot = df.pivot_table(index='experiment', columns='workload',
+                                             values='ipc', aggfunc='mean')
+            
             print("\nPerformance Summary:")
             print(df.to_string(index=False, float_format='%.4f'))
             
             # Save to CSV
             csv_path = self.results_base_dir / 'performance_comparison.csv'
-            df.to_csv(csv_path, index=False, float_format='%.6f')
+            write_csv(df, csv_path)
             print(f"\nDetailed results saved to: {csv_path}")
             
             return df
@@ -173,6 +394,11 @@ class Gem5ResultsAnalyzer:
         """Create IPC comparison plots"""
         if df is None or df.empty:
             return
+        
+        # Plots are only saved to disk, so skip interactive backend discovery
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
             
         # IPC by workload and experiment
         plt.figure(figsize=(12, 6))
@@ -180,15 +406,15 @@ class Gem5ResultsAnalyzer:
         workloads = df['workload'].unique()
         experiments = df['experiment'].unique()
         
+        # IPC for every (experiment, workload) pair, looked up from one dict
+        # built in a single pass over the frame
+        ipc_lookup = dict(zip(zip(df['experiment'], df['workload']), df['ipc']))
+        
         x_pos = range(len(workloads))
         width = 0.8 / len(experiments)
         
         for i, exp in enumerate(experiments):
-            exp_data = df[df['experiment'] == exp]
-            ipc_values = [exp_data[exp_data['workload'] == w]['ipc'].iloc[0] 
-                         if not exp_data[exp_data['workload'] == w].empty else 0 
-                         for w in workloads]
-            
+            ipc_values = [ipc_lookup.get((exp, w), 0) for w in workloads]
             plt.bar([x + i * width for x in x_pos], ipc_values, 
                    width, label=exp, alpha=0.8)
         
@@ -209,16 +435,20 @@ class Gem5ResultsAnalyzer:
         if 'branch_prediction' not in self.experiments:
             print("Branch prediction experiment data not found")
             return
+        
+        import pandas as pd
             
         print("\n=== Branch Prediction Analysis ===")
         
         bp_data = self.experiments['branch_prediction']
+        bp_frame = add_derived_metrics(pd.DataFrame(
+            [data['stats'] for data in bp_data.values()], index=list(bp_data)))
         
         for workload, data in bp_data.items():
             stats = data['stats']
             print(f"\n{workload.upper()}:")
             print(f"  IPC: {stats.get('ipc', 0):.4f}")
-            print(f"  Branch Accuracy: {stats.get('branch_accuracy', 0):.4f}")
+            print(f"  Branch Accuracy: {bp_frame.at[workload, 'branch_accuracy']:.4f}")
             print(f"  Branch Lookups: {stats.get('branch_lookups', 0)}")
             print(f"  Branch Mispredictions: {stats.get('branch_condIncorrect', 0)}")
     
@@ -268,13 +498,13 @@ class Gem5ResultsAnalyzer:
             print(f"Best IPC: {best_ipc['ipc']:.4f} ({best_ipc['experiment']} - {best_ipc['workload']})")
             
             # IPC by workload type
-            workload_avg = df.groupby('workload')['ipc'].mean()
+            workload_avg = self._ipc_pivot.mean(axis=0)
             print(f"\nAverage IPC by workload:")
             for workload, avg_ipc in workload_avg.items():
                 print(f"  {workload}: {avg_ipc:.4f}")
                 
             # IPC by experiment type  
-            exp_avg = df.groupby('experiment')['ipc'].mean()
+            exp_avg = self._ipc_pivot.mean(axis=1)
             print(f"\nAverage IPC by experiment:")
             for experiment, avg_ipc in exp_avg.items():
                 print(f"  {experiment}: {avg_ipc:.4f}")
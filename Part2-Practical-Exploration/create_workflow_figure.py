@@ -4,30 +4,51 @@ Create Figure 5: Experimental Workflow
 Diagram showing methodology from setup through analysis
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import FancyBboxPatch, Rectangle, Circle, Arrow
-import numpy as np
 import os
+from pathlib import Path
+from xml.sax.saxutils import escape
 
-# Set up styling
-plt.style.use('default')
-plt.rcParams.update({
-    'font.family': 'Arial',
-    'font.size': 10,
-    'axes.linewidth': 1.2,
-    'figure.facecolor': 'white',
-    'axes.facecolor': 'white',
-    'text.color': 'black',
-    'axes.edgecolor': 'black'
-})
+# Canvas is 16x12 inches in points; diagram coordinates run 0-100 on both
+# axes with the origin at the bottom-left, as in a matplotlib data space
+WIDTH, HEIGHT = 16 * 72, 12 * 72
+SX, SY = WIDTH / 100, HEIGHT / 100
+FONT_FAMILY = 'Arial, Helvetica, sans-serif'
+
+def _px(x):
+    return f'{x * SX:.2f}'
+
+def _py(y):
+    return f'{(100 - y) * SY:.2f}'
+
+def box(x, y, w, h, facecolor, edgecolor, linewidth=1, pad=0.0):
+    """Rounded box whose corners extend `pad` beyond (x, y, w, h)"""
+    return (f'<rect x="{_px(x - pad)}" y="{_py(y + h + pad)}" '
+            f'width="{(w + 2 * pad) * SX:.2f}" height="{(h + 2 * pad) * SY:.2f}" '
+            f'rx="{pad * SX:.2f}" ry="{pad * SY:.2f}" fill="{facecolor}" '
+            f'stroke="{edgecolor}" stroke-width="{linewidth}"/>')
+
+def text(x, y, s, ha='left', fontsize=10, weight='normal', style='normal', color='black'):
+    """Text vertically centred on y; multi-line strings are centred as a block"""
+    anchor = {'left': 'start', 'center': 'middle', 'right': 'end'}[ha]
+    lines = s.split('\n')
+    line_height = 1.2 * fontsize
+    first_dy = -line_height * (len(lines) - 1) / 2
+    spans = ''.join(
+        f'<tspan x="{_px(x)}" dy="{first_dy if i == 0 else line_height:.2f}">{escape(line)}</tspan>'
+        for i, line in enumerate(lines))
+    return (f'<text x="{_px(x)}" y="{_py(y)}" text-anchor="{anchor}" '
+            f'dominant-baseline="central" font-size="{fontsize}" font-weight="{weight}" '
+            f'font-style="{style}" fill="{color}">{spans}</text>')
+
+def arrow(xy, xytext, color, lw=2):
+    """Open-headed arrow from xytext to xy"""
+    return (f'<line x1="{_px(xytext[0])}" y1="{_py(xytext[1])}" '
+            f'x2="{_px(xy[0])}" y2="{_py(xy[1])}" stroke="{color}" '
+            f'stroke-width="{lw}" marker-end="url(#arrowhead)"/>')
 
 def create_experimental_workflow_figure():
     """Create Figure 5: Experimental Workflow"""
-    fig, ax = plt.subplots(figsize=(16, 12))
-    ax.set_xlim(0, 100)
-    ax.set_ylim(0, 100)
-    ax.axis('off')
+    svg = []
     
     # Define colors for different phases
     colors = {
@@ -42,44 +63,43 @@ def create_experimental_workflow_figure():
     }
     
     # Title
-    ax.text(50, 95, 'Experimental Workflow and Implementation', 
-            ha='center', va='center', fontsize=16, weight='bold', color=colors['text'])
-    ax.text(50, 92, 'Complete ILP Study Methodology: Environment Setup → Analysis → Visualization', 
-            ha='center', va='center', fontsize=12, style='italic', color=colors['text'])
-    
-    # Phase 1: Environment Setup
-    phase1_box = FancyBboxPatch((2, 75), 18, 15, 
-                               boxstyle="round,pad=0.5", 
-                               facecolor=colors['setup'], 
-                               edgecolor=colors['border'], 
-                               linewidth=2)
-    ax.add_patch(phase1_box)
-    
-    ax.text(11, 87, 'Phase 1: Environment Setup', 
-            ha='center', va='center', fontsize=11, weight='bold', color=colors['text'])
-    
-    setup_steps = [
-        '• Python 3.9 Virtual Environment',
-        '• Install Dependencies',
-        '• gem5 Simulator Setup',
-        '• Workspace Configuration'
+    svg.append(text(50, 95, 'Experimental Workflow and Implementation', 
+                    ha='center', fontsize=16, weight='bold', color=colors['text']))
+    svg.append(text(50, 92, 'Complete ILP Study Methodology: Environment Setup → Analysis → Visualization', 
+                    ha='center', fontsize=12, style='italic', color=colors['text']))
+    
+    # Top row: one box per workflow phase, with a bulleted step list
+    phases = [
+        dict(x=2, w=18, color=colors['setup'], title='Phase 1: Environment Setup', steps=[
+            '• Python 3.9 Virtual Environment',
+            '• Install Dependencies',
+            '• gem5 Simulator Setup',
+            '• Workspace Configuration'
+        ]),
+        dict(x=25, w=25, color=colors['config'], title='Phase 2: Configuration & Workloads', steps=[]),
+        dict(x=55, w=20, color=colors['execution'], title='Phase 3: Simulation Execution', steps=[
+            '• gem5 Simulation Runs',
+            '• Performance Data Collection',
+            '• Statistics Generation',
+            '• Results Validation'
+        ]),
+        dict(x=80, w=18, color=colors['analysis'], title='Phase 4: Data Analysis', steps=[
+            '• Performance Metrics',
+            '• Statistical Analysis',
+            '• Comparative Studies',
+            '• Trend Identification'
+        ]),
     ]
     
-    for i, step in enumerate(setup_steps):
-        ax.text(3, 84 - i*2, step, ha='left', va='center', fontsize=9, color=colors['text'])
-    
-    # Phase 2: Configuration & Workloads
-    phase2_box = FancyBboxPatch((25, 75), 25, 15, 
-                               boxstyle="round,pad=0.5", 
-                               facecolor=colors['config'], 
-                               edgecolor=colors['border'], 
-                               linewidth=2)
-    ax.add_patch(phase2_box)
+    for phase in phases:
+        x, w = phase['x'], phase['w']
+        svg.append(box(x, 75, w, 15, phase['color'], colors['border'], linewidth=2, pad=0.5))
+        svg.append(text(x + w / 2, 87, phase['title'], 
+                        ha='center', fontsize=11, weight='bold', color=colors['text']))
+        for i, step in enumerate(phase['steps']):
+            svg.append(text(x + 1, 84 - i*2, step, ha='left', fontsize=9, color=colors['text']))
     
-    ax.text(37.5, 87, 'Phase 2: Configuration & Workloads', 
-            ha='center', va='center', fontsize=11, weight='bold', color=colors['text'])
-    
-    # Configuration sub-boxes
+    # Phase 2 shows the configuration sub-boxes instead of a step list
     config_boxes = [
         ('Basic Pipeline\nTimingSimpleCPU', 26, 82, '#FFE0B2'),
         ('Branch Prediction\nTournament/Local', 33, 82, '#F8BBD9'),
@@ -88,68 +108,23 @@ def create_experimental_workflow_figure():
     ]
     
     for label, x, y, color in config_boxes:
-        box = FancyBboxPatch((x-2, y-2), 6, 4, 
-                            boxstyle="round,pad=0.2", 
-                            facecolor=color, 
-                            edgecolor=colors['border'], 
-                            linewidth=1)
-        ax.add_patch(box)
-        ax.text(x+1, y, label, ha='center', va='center', fontsize=8, color=colors['text'])
-    
-    # Phase 3: Simulation Execution
-    phase3_box = FancyBboxPatch((55, 75), 20, 15, 
-                               boxstyle="round,pad=0.5", 
-                               facecolor=colors['execution'], 
-                               edgecolor=colors['border'], 
-                               linewidth=2)
-    ax.add_patch(phase3_box)
-    
-    ax.text(65, 87, 'Phase 3: Simulation Execution', 
-            ha='center', va='center', fontsize=11, weight='bold', color=colors['text'])
-    
-    execution_steps = [
-        '• gem5 Simulation Runs',
-        '• Performance Data Collection',
-        '• Statistics Generation',
-        '• Results Validation'
-    ]
-    
-    for i, step in enumerate(execution_steps):
-        ax.text(56, 84 - i*2, step, ha='left', va='center', fontsize=9, color=colors['text'])
-    
-    # Phase 4: Data Analysis
-    phase4_box = FancyBboxPatch((80, 75), 18, 15, 
-                               boxstyle="round,pad=0.5", 
-                               facecolor=colors['analysis'], 
-                               edgecolor=colors['border'], 
-                               linewidth=2)
-    ax.add_patch(phase4_box)
-    
-    ax.text(89, 87, 'Phase 4: Data Analysis', 
-            ha='center', va='center', fontsize=11, weight='bold', color=colors['text'])
-    
-    analysis_steps = [
-        '• Performance Metrics',
-        '• Statistical Analysis',
-        '• Comparative Studies',
-        '• Trend Identification'
+        svg.append(box(x-2, y-2, 6, 4, color, colors['border'], linewidth=1, pad=0.2))
+        svg.append(text(x+1, y, label, ha='center', fontsize=8, color=colors['text']))
+    
+    # Lower rows: titled sections that hold the detailed components
+    sections = [
+        (2, 50, 30, 20, '#FFF8E1', 'Workload Development & Compilation'),
+        (35, 50, 30, 20, '#F3E5F5', 'gem5 Configuration Matrix'),
+        (68, 50, 30, 20, colors['output'], 'Results & Visualization Pipeline'),
+        (2, 25, 45, 20, '#FFF3E0', 'Key Performance Metrics & Analysis Methods'),
+        (50, 25, 48, 20, '#F1F8E9', 'Tools & Technologies Used'),
+        (2, 2, 96, 18, '#FFEBEE', 'Validation & Quality Assurance Framework'),
     ]
     
-    for i, step in enumerate(analysis_steps):
-        ax.text(81, 84 - i*2, step, ha='left', va='center', fontsize=9, color=colors['text'])
-    
-    # Detailed Workflow Components
-    
-    # Workload Development Section
-    workload_box = FancyBboxPatch((2, 50), 30, 20, 
-                                 boxstyle="round,pad=0.5", 
-                                 facecolor='#FFF8E1', 
-                                 edgecolor=colors['border'], 
-                                 linewidth=2)
-    ax.add_patch(workload_box)
-    
-    ax.text(17, 67, 'Workload Development & Compilation', 
-            ha='center', va='center', fontsize=12, weight='bold', color=colors['text'])
+    for x, y, w, h, color, title in sections:
+        svg.append(box(x, y, w, h, color, colors['border'], linewidth=2, pad=0.5))
+        svg.append(text(x + w / 2, y + h - 3, title, 
+                        ha='center', fontsize=12, weight='bold', color=colors['text']))
     
     # Individual workload boxes
     workloads = [
@@ -159,153 +134,42 @@ def create_experimental_workflow_figure():
     ]
     
     for label, x, y, color in workloads:
-        box = FancyBboxPatch((x, y-4), 8, 8, 
-                            boxstyle="round,pad=0.3", 
-                            facecolor=color, 
-                            edgecolor=colors['border'], 
-                            linewidth=1)
-        ax.add_patch(box)
-        ax.text(x+4, y, label, ha='center', va='center', fontsize=8, color=colors['text'])
+        svg.append(box(x, y-4, 8, 8, color, colors['border'], linewidth=1, pad=0.3))
+        svg.append(text(x+4, y, label, ha='center', fontsize=8, color=colors['text']))
     
-    # gem5 Configuration Matrix
-    config_box = FancyBboxPatch((35, 50), 30, 20, 
-                               boxstyle="round,pad=0.5", 
-                               facecolor='#F3E5F5', 
-                               edgecolor=colors['border'], 
-                               linewidth=2)
-    ax.add_patch(config_box)
-    
-    ax.text(50, 67, 'gem5 Configuration Matrix', 
-            ha='center', va='center', fontsize=12, weight='bold', color=colors['text'])
-    
-    # Configuration matrix
-    configs = [
+    # Configuration matrix and results components share the small card layout
+    small_cards = [
         ('Basic Pipeline', 'TimingSimpleCPU\n5-stage pipeline\n1 GHz frequency', 37, 61),
         ('Branch Prediction', 'Tournament/Local\nPrediction accuracy\nMiss penalty analysis', 50, 61),
         ('Superscalar', 'O3CPU Model\n1-8 way issue\nResource utilization', 37, 54),
-        ('Cache Hierarchy', 'L1: 16KB I-cache\nL1: 64KB D-cache\nL2: 256KB unified', 50, 54)
-    ]
-    
-    for title, desc, x, y in configs:
-        box = FancyBboxPatch((x, y-2), 11, 5, 
-                            boxstyle="round,pad=0.2", 
-                            facecolor='#FFFFFF', 
-                            edgecolor=colors['border'], 
-                            linewidth=1)
-        ax.add_patch(box)
-        ax.text(x+0.5, y+1.5, title, ha='left', va='center', fontsize=9, weight='bold', color=colors['text'])
-        ax.text(x+0.5, y-0.5, desc, ha='left', va='center', fontsize=7, color=colors['text'])
-    
-    # Results & Visualization Section
-    results_box = FancyBboxPatch((68, 50), 30, 20, 
-                                boxstyle="round,pad=0.5", 
-                                facecolor=colors['output'], 
-                                edgecolor=colors['border'], 
-                                linewidth=2)
-    ax.add_patch(results_box)
-    
-    ax.text(83, 67, 'Results & Visualization Pipeline', 
-            ha='center', va='center', fontsize=12, weight='bold', color=colors['text'])
-    
-    # Results components
-    results = [
+        ('Cache Hierarchy', 'L1: 16KB I-cache\nL1: 64KB D-cache\nL2: 256KB unified', 50, 54),
         ('Performance\nMetrics', 'IPC Analysis\nScaling Factors\nEfficiency Ratios', 70, 61),
         ('Statistical\nValidation', 'Multiple Runs\nConfidence Intervals\nSignificance Tests', 83, 61),
         ('Figure\nGeneration', 'Charts\nComparative Analysis\nTrend Visualization', 70, 54),
         ('Report\nIntegration', 'Academic Format\nAPA Citations\nReproducibility', 83, 54)
     ]
     
-    for title, desc, x, y in results:
-        box = FancyBboxPatch((x, y-2), 11, 5, 
-                            boxstyle="round,pad=0.2", 
-                            facecolor='#FFFFFF', 
-                            edgecolor=colors['border'], 
-                            linewidth=1)
-        ax.add_patch(box)
-        ax.text(x+0.5, y+1.5, title, ha='left', va='center', fontsize=9, weight='bold', color=colors['text'])
-        ax.text(x+0.5, y-0.5, desc, ha='left', va='center', fontsize=7, color=colors['text'])
-    
-    # Data Flow Arrows
-    arrow_props = dict(arrowstyle='->', lw=2, color=colors['accent'])
-    
-    # Horizontal flow arrows
-    ax.annotate('', xy=(24, 82.5), xytext=(20, 82.5), arrowprops=arrow_props)
-    ax.annotate('', xy=(54, 82.5), xytext=(50, 82.5), arrowprops=arrow_props)
-    ax.annotate('', xy=(79, 82.5), xytext=(75, 82.5), arrowprops=arrow_props)
-    
-    # Vertical flow arrows
-    ax.annotate('', xy=(17, 70), xytext=(17, 73), arrowprops=arrow_props)
-    ax.annotate('', xy=(50, 70), xytext=(50, 73), arrowprops=arrow_props)
-    ax.annotate('', xy=(83, 70), xytext=(83, 73), arrowprops=arrow_props)
-    
-    # Performance Metrics Section
-    metrics_box = FancyBboxPatch((2, 25), 45, 20, 
-                                boxstyle="round,pad=0.5", 
-                                facecolor='#FFF3E0', 
-                                edgecolor=colors['border'], 
-                                linewidth=2)
-    ax.add_patch(metrics_box)
+    for title, desc, x, y in small_cards:
+        svg.append(box(x, y-2, 11, 5, '#FFFFFF', colors['border'], linewidth=1, pad=0.2))
+        svg.append(text(x+0.5, y+1.5, title, ha='left', fontsize=9, weight='bold', color=colors['text']))
+        svg.append(text(x+0.5, y-0.5, desc, ha='left', fontsize=7, color=colors['text']))
     
-    ax.text(24.5, 42, 'Key Performance Metrics & Analysis Methods', 
-            ha='center', va='center', fontsize=12, weight='bold', color=colors['text'])
-    
-    # Metrics grid
-    metrics = [
+    # Metrics grid and tools grid share the wide card layout
+    wide_cards = [
         ('Instructions Per Cycle (IPC)', 'Primary performance indicator\nRatio of committed instructions to cycles', 4, 37),
         ('Branch Prediction Accuracy', 'Percentage of correct predictions\nMiss penalty quantification', 25, 37),
         ('Resource Utilization', 'Functional unit occupancy\nPipeline stage efficiency', 4, 30),
-        ('Cache Performance', 'Hit rates and access latencies\nMemory hierarchy analysis', 25, 30)
-    ]
-    
-    for title, desc, x, y in metrics:
-        box = FancyBboxPatch((x, y-2), 20, 5, 
-                            boxstyle="round,pad=0.3", 
-                            facecolor='#FFFFFF', 
-                            edgecolor=colors['border'], 
-                            linewidth=1)
-        ax.add_patch(box)
-        ax.text(x+1, y+1, title, ha='left', va='center', fontsize=9, weight='bold', color=colors['text'])
-        ax.text(x+1, y-0.8, desc, ha='left', va='center', fontsize=8, color=colors['text'])
-    
-    # Tools & Technologies Section
-    tools_box = FancyBboxPatch((50, 25), 48, 20, 
-                              boxstyle="round,pad=0.5", 
-                              facecolor='#F1F8E9', 
-                              edgecolor=colors['border'], 
-                              linewidth=2)
-    ax.add_patch(tools_box)
-    
-    ax.text(74, 42, 'Tools & Technologies Used', 
-            ha='center', va='center', fontsize=12, weight='bold', color=colors['text'])
-    
-    # Tools grid
-    tools = [
+        ('Cache Performance', 'Hit rates and access latencies\nMemory hierarchy analysis', 25, 30),
         ('gem5 Simulator', 'v24.0.0.0\nArchitectural modeling\nPerformance simulation', 52, 37),
         ('Python Ecosystem', 'matplotlib, pandas, numpy\nData analysis & visualization\nStatistical computing', 73, 37),
         ('Development Environment', 'macOS with Apple Silicon\nPython 3.9 virtual environment\nGCC compiler toolchain', 52, 30),
         ('Version Control', 'Git repository management\nExperimental reproducibility\nCode documentation', 73, 30)
     ]
     
-    for title, desc, x, y in tools:
-        box = FancyBboxPatch((x, y-2), 20, 5, 
-                            boxstyle="round,pad=0.3", 
-                            facecolor='#FFFFFF', 
-                            edgecolor=colors['border'], 
-                            linewidth=1)
-        ax.add_patch(box)
-        ax.text(x+1, y+1, title, ha='left', va='center', fontsize=9, weight='bold', color=colors['text'])
-        ax.text(x+1, y-0.8, desc, ha='left', va='center', fontsize=8, color=colors['text'])
-    
-    # Validation & Quality Assurance
-    qa_box = FancyBboxPatch((2, 2), 96, 18, 
-                           boxstyle="round,pad=0.5", 
-                           facecolor='#FFEBEE', 
-                           edgecolor=colors['border'], 
-                           linewidth=2)
-    ax.add_patch(qa_box)
-    
-    ax.text(50, 17, 'Validation & Quality Assurance Framework', 
-            ha='center', va='center', fontsize=12, weight='bold', color=colors['text'])
+    for title, desc, x, y in wide_cards:
+        svg.append(box(x, y-2, 20, 5, '#FFFFFF', colors['border'], linewidth=1, pad=0.3))
+        svg.append(text(x+1, y+1, title, ha='left', fontsize=9, weight='bold', color=colors['text']))
+        svg.append(text(x+1, y-0.8, desc, ha='left', fontsize=8, color=colors['text']))
     
     # QA components
     qa_items = [
@@ -317,23 +181,41 @@ def create_experimental_workflow_figure():
     ]
     
     for title, items, x, y in qa_items:
-        box = FancyBboxPatch((x-3, y-3), 18, 8, 
-                            boxstyle="round,pad=0.3", 
-                            facecolor='#FFFFFF', 
-                            edgecolor=colors['border'], 
-                            linewidth=1)
-        ax.add_patch(box)
-        ax.text(x, y+2, title, ha='center', va='center', fontsize=9, weight='bold', color=colors['text'])
-        ax.text(x-2, y-1, items, ha='left', va='center', fontsize=7, color=colors['text'])
+        svg.append(box(x-3, y-3, 18, 8, '#FFFFFF', colors['border'], linewidth=1, pad=0.3))
+        svg.append(text(x, y+2, title, ha='center', fontsize=9, weight='bold', color=colors['text']))
+        svg.append(text(x-2, y-1, items, ha='left', fontsize=7, color=colors['text']))
+    
+    # Data flow arrows: across the phases, then down into the sections
+    flow_arrows = [
+        ((24, 82.5), (20, 82.5)),
+        ((54, 82.5), (50, 82.5)),
+        ((79, 82.5), (75, 82.5)),
+        ((17, 70), (17, 73)),
+        ((50, 70), (50, 73)),
+        ((83, 70), (83, 73)),
+    ]
+    
+    for head, tail in flow_arrows:
+        svg.append(arrow(head, tail, colors['accent']))
+    
+    # The diagram is static, so write the SVG markup directly
+    document = '\n'.join([
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}pt" height="{HEIGHT}pt" '
+        f'viewBox="0 0 {WIDTH} {HEIGHT}" font-family="{FONT_FAMILY}">',
+        '<defs><marker id="arrowhead" viewBox="0 0 10 10" refX="9" refY="5" '
+        'markerWidth="5" markerHeight="5" orient="auto-start-reverse">'
+        f'<path d="M 0 0 L 10 5 L 0 10" fill="none" stroke="{colors["accent"]}" stroke-width="2"/>'
+        '</marker></defs>',
+        f'<rect width="{WIDTH}" height="{HEIGHT}" fill="white"/>',
+        *svg,
+        '</svg>',
+    ])
     
-    plt.tight_layout()
     os.makedirs('figures', exist_ok=True)
-    plt.savefig('figures/figure_5_experimental_workflow.png', 
-                dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
+    Path('figures/figure_5_experimental_workflow.svg').write_text(document, encoding='utf-8')
     
     print("Figure 5: Experimental Workflow created successfully!")
-    print("Saved as: figures/figure_5_experimental_workflow.png")
+    print("Saved as: figures/figure_5_experimental_workflow.svg")
     print("Workflow diagram ready!")
 
 def main():
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+"""
+Shared System Construction for gem5 ILP Experiments
+Clock domain, cache hierarchy, memory bus, interrupt and DRAM wiring used by
+the basic pipeline, branch prediction and superscalar configurations
+"""
+
+import sys
+import os
+
+import m5
+from m5.defines import buildEnv
+from m5.objects import (
+    AddrRange, AtomicSimpleCPU, L2XBar, MemCtrl, Process, SrcClockDomain,
+    System, SystemXBar, VoltageDomain,
+)
+from m5.util import fatal, warn
+
+# The target ISA is fixed for the gem5 binary, so check it once at import
+_IS_X86 = buildEnv['TARGET_ISA'] == 'x86'
+
+def _connect_x86_interrupts(cpu, membus):
+    """Wire the x86 local APIC's PIO and interrupt ports to the memory bus"""
+    cpu.interrupts[0].pio = membus.mem_side_ports
+    cpu.interrupts[0].int_requestor = membus.cpu_side_ports
+    cpu.interrupts[0].int_responder = membus.mem_side_ports
+
+def make_system(cpu, l1i, l1d, l2, dram, clk='1GHz', mem_size='512MB', fast_forward=0):
+    """Build a System around cpu with split L1 caches, a shared L2 and DRAM
+
+    With fast_forward > 0 an AtomicSimpleCPU (system.ff_cpu) runs the first
+    fast_forward instructions and cpu starts switched out.
+    """
+
+    # Create the system
+    system = System()
+
+    # Set clock domain
+    system.clk_domain = SrcClockDomain()
+    system.clk_domain.clock = clk
+    system.clk_domain.voltage_domain = VoltageDomain()
+
+    # Set memory mode (atomic while fast-forwarding, switchCpus moves to timing)
+    system.mem_mode = 'atomic' if fast_forward else 'timing'
+    system.mem_ranges = [AddrRange(mem_size)]
+
+    # Detailed CPU, plus the atomic CPU that runs program startup before it
+    system.cpu = cpu
+    if fast_forward:
+        system.ff_cpu = AtomicSimpleCPU(max_insts_any_thread=fast_forward)
+        system.cpu.switched_out = True
+
+    # L1 instruction and data caches
+    system.cpu.icache = l1i
+    system.cpu.dcache = l1d
+
+    # Connect CPU to caches (the detailed CPU inherits the ports when it switches in)
+    first_cpu = system.ff_cpu if fast_forward else system.cpu
+    first_cpu.icache_port = system.cpu.icache.cpu_side
+    first_cpu.dcache_port = system.cpu.dcache.cpu_side
+
+    # L2 cache behind its own bus
+    system.l2cache = l2
+    system.l2bus = L2XBar()
+
+    # Create a memory bus
+    system.membus = SystemXBar()
+
+    # Connect L1 caches to L2 bus
+    system.cpu.icache.mem_side = system.l2bus.cpu_side_ports
+    system.cpu.dcache.mem_side = system.l2bus.cpu_side_ports
+
+    # Connect L2 cache to L2 bus and memory bus
+    system.l2cache.cpu_side = system.l2bus.mem_side_ports
+    system.l2cache.mem_side = system.membus.cpu_side_ports
+
+    # Create interrupt controller; a switched-out detailed CPU has none of its
+    # own and takes over ff_cpu's in switchCpus, as in configs/common/Simulation.py
+    first_cpu.createInterruptController()
+
+    # Connect special ports for x86
+    if _IS_X86:
+        _connect_x86_interrupts(first_cpu, system.membus)
+
+    # Create memory controller
+    system.mem_ctrl = MemCtrl()
+    system.mem_ctrl.dram = dram
+    system.mem_ctrl.dram.range = system.mem_ranges[0]
+    system.mem_ctrl.port = system.membus.mem_side_ports
+
+    # Connect system port to memory bus
+    system.system_port = system.membus.cpu_side_ports
+
+    return system
+
+def set_if_supported(cpu, name, value):
+    """Set a CPU parameter only when this gem5 build declares it (e.g. from a local patch)"""
+    if name in type(cpu)._params:
+        setattr(cpu, name, value)
+    else:
+        warn(f"{type(cpu).__name__} has no '{name}' parameter in this gem5 build; not set")
+
+def set_workload(system, binary_path):
+    """Set the workload/binary to execute"""
+    print(f"Setting workload: {binary_path}")
+
+    if not os.path.isfile(binary_path):
+        fatal(f"Binary file {binary_path} not found!")
+
+    # Make sure the binary is executable
+    if not os.access(binary_path, os.X_OK):
+        warn(f"Binary {binary_path} may not be executable")
+
+    # Create process
+    process = Process()
+    process.cmd = [binary_path]
+
+    # The fast-forward CPU runs the same process until the switch; the
+    # detailed CPU shares its ISA objects (createThreads only makes new ones
+    # when none are set), as configs/common/Simulation.py does for switch_cpus
+    if hasattr(system, 'ff_cpu'):
+        system.ff_cpu.workload = process
+        system.ff_cpu.createThreads()
+        system.cpu.isa = system.ff_cpu.isa
+
+    system.cpu.workload = process
+    system.cpu.createThreads()
+
+    print(f"Workload set successfully: {process.cmd}")
+
+def run_fast_forward(system):
+    """Run the atomic CPU to its instruction limit, then switch to the detailed CPU"""
+    exit_event = m5.simulate()
+    print(f"Fast-forward finished at tick {m5.curTick()}: {exit_event.getCause()}")
+
+    m5.switchCpus(system, [(system.ff_cpu, system.cpu)])
+    m5.stats.reset()
+
+def add_hdf5_stats():
+    """Also dump stats to <outdir>/stats.h5 when gem5 was built with HDF5"""
+    # analyze_results.py reads stats.h5 in preference to parsing stats.txt
+    if buildEnv.get('HAVE_HDF5'):
+        m5.stats.addStatVisitor('h5://stats.h5')
+
+def warn_if_slow_build():
+    """Warn when not running under gem5.fast (assertions and tracing compiled in)"""
+    binary = os.path.basename(sys.executable)
+    if not binary.endswith('.fast'):
+        warn(f"Running under {binary}; build/X86/gem5.fast simulates noticeably faster")
@@ -16,127 +16,106 @@ sys.path.append(gem5_path + '/configs/')
 sys.path.append(gem5_path + '/configs/common')
 
 import m5
-from m5.defines import buildEnv
-from m5.objects import *
-from m5.util import addToPath, fatal, warn
+from m5.objects import (
+    Cache, DDR4_2400_8x8, DefaultO3FUPool, IndirectMemoryPrefetcher, LTAGE,
+    MultiPrefetcher, O3CPU, Root, SignaturePathPrefetcher, StridePrefetcher,
+)
 
-def create_superscalar_system(issue_width=4, rob_size=192):
-    """Create an out-of-order superscalar processor system"""
-    
-    # Create the system
-    system = System()
-    
-    # Set clock domain (higher frequency for superscalar)
-    system.clk_domain = SrcClockDomain()
-    system.clk_domain.clock = '2GHz'  # Higher frequency
-    system.clk_domain.voltage_domain = VoltageDomain()
-    
-    # Set memory mode
-    system.mem_mode = 'timing'
-    system.mem_ranges = [AddrRange('1GB')]  # Larger memory for complex workloads
+from _common import (add_hdf5_stats, make_system, set_if_supported, set_workload,
+                     run_fast_forward, warn_if_slow_build)
+
+# L2 prefetchers selectable with --l2-prefetcher; stride only catches
+# constant-stride streams, indirect/SPP also cover pointer and irregular patterns
+L2_PREFETCHERS = {
+    'stride': lambda: StridePrefetcher(degree=8, latency=1),
+    'indirect': lambda: IndirectMemoryPrefetcher(),
+    'spp': lambda: SignaturePathPrefetcher(),
+    'stride+indirect': lambda: MultiPrefetcher(
+        prefetchers=[StridePrefetcher(degree=8, latency=1), IndirectMemoryPrefetcher()]),
+}
+
+def create_superscalar_system(issue_width=4, rob_size=192, fast_forward=0, l2_prefetcher='stride'):
+    """Create an out-of-order superscalar processor system
+
+    With fast_forward > 0 an AtomicSimpleCPU (system.ff_cpu) runs the first
+    fast_forward instructions and the O3CPU starts switched out.
+    """
     
     # Create O3CPU (Out-of-Order CPU) for superscalar simulation
-    system.cpu = O3CPU()
+    cpu = O3CPU()
     
     # Configure superscalar parameters
-    system.cpu.fetchWidth = issue_width      # Instructions fetched per cycle
-    system.cpu.decodeWidth = issue_width     # Instructions decoded per cycle
-    system.cpu.renameWidth = issue_width     # Instructions renamed per cycle
-    system.cpu.issueWidth = issue_width      # Instructions issued per cycle
-    system.cpu.wbWidth = issue_width         # Instructions written back per cycle
-    system.cpu.commitWidth = issue_width     # Instructions committed per cycle
+    cpu.fetchWidth = issue_width      # Instructions fetched per cycle
+    cpu.decodeWidth = issue_width     # Instructions decoded per cycle
+    cpu.renameWidth = issue_width     # Instructions renamed per cycle
+    cpu.issueWidth = issue_width      # Instructions issued per cycle
+    cpu.wbWidth = issue_width         # Instructions written back per cycle
+    cpu.commitWidth = issue_width     # Instructions committed per cycle
     
     # Reorder Buffer (ROB) configuration
-    system.cpu.numROBEntries = rob_size
+    cpu.numROBEntries = rob_size
     
     # Instruction Queue sizes
-    system.cpu.numIQEntries = 64    # Integer instruction queue
-    system.cpu.numLQEntries = 32    # Load queue
-    system.cpu.numSQEntries = 32    # Store queue
+    cpu.numIQEntries = 64    # Integer instruction queue
+    cpu.numLQEntries = 32    # Load queue
+    cpu.numSQEntries = 32    # Store queue
+    
+    # Size the DynInst free-list to the in-flight window. Only patched gem5
+    # builds provide one; stock O3CPU allocates every DynInst with new/delete
+    # and set_if_supported warns that the parameter was not set
+    window = rob_size + int(cpu.numIQEntries) + int(cpu.numLQEntries) + int(cpu.numSQEntries)
+    set_if_supported(cpu, 'dynInstPoolSize', window)
+    
+    # Stop fetching down a path already known to be mispredicted, so the host
+    # does not simulate wrong-path instructions only to squash them. Stock
+    # O3CPU has no such parameter; there this warns and changes nothing
+    set_if_supported(cpu, 'haltFetchOnMispredict', True)
     
     # Physical register file sizes
-    system.cpu.numPhysIntRegs = 256  # Integer physical registers
-    system.cpu.numPhysFloatRegs = 256  # Floating-point physical registers
+    cpu.numPhysIntRegs = 256  # Integer physical registers
+    cpu.numPhysFloatRegs = 256  # Floating-point physical registers
     
     # Functional Units configuration
-    system.cpu.fuPool = DefaultO3FUPool()
+    cpu.fuPool = DefaultO3FUPool()
     
-    # Branch prediction (advanced for superscalar)
-    system.cpu.branchPred = TournamentBP()
-    system.cpu.branchPred.localPredictorSize = 2048
-    system.cpu.branchPred.localCtrBits = 2
-    system.cpu.branchPred.globalPredictorSize = 8192
-    system.cpu.branchPred.globalCtrBits = 2
-    system.cpu.branchPred.choicePredictorSize = 8192
-    system.cpu.branchPred.choiceCtrBits = 2
+    # Branch prediction (advanced for superscalar): L-TAGE mispredicts far
+    # less than tournament at similar storage, and mispredicts cap wide-issue IPC
+    cpu.branchPred = LTAGE()
     
     # BTB (Branch Target Buffer) configuration
-    system.cpu.branchPred.BTBEntries = 4096
-    system.cpu.branchPred.BTBTagSize = 16
+    cpu.branchPred.BTBEntries = 4096
+    cpu.branchPred.BTBTagSize = 16
     
     # RAS (Return Address Stack) configuration
-    system.cpu.branchPred.RASSize = 16
-    
-    # Cache configuration - larger for superscalar
-    system.cpu.icache = Cache(size='64kB', assoc=4, tag_latency=1, data_latency=1, 
-                             response_latency=1, mshrs=8, tgts_per_mshr=20)
-    system.cpu.dcache = Cache(size='64kB', assoc=4, tag_latency=2, data_latency=2,
-                             response_latency=1, mshrs=8, tgts_per_mshr=20)
-    
-    # Connect CPU to caches
-    system.cpu.icache.cpu_side = system.cpu.icache_port
-    system.cpu.dcache.cpu_side = system.cpu.dcache_port
-    
-    # Larger L2 cache for superscalar
-    system.l2cache = Cache(size='1MB', assoc=16, tag_latency=12, data_latency=12,
-                          response_latency=5, mshrs=20, tgts_per_mshr=12)
+    cpu.branchPred.RASSize = 16
+    
+    # Larger caches, higher clock and faster memory for superscalar
+    system = make_system(
+        cpu,
+        l1i=Cache(size='64kB', assoc=4, tag_latency=1, data_latency=1,
+                  response_latency=1, mshrs=8, tgts_per_mshr=20),
+        l1d=Cache(size='64kB', assoc=4, tag_latency=2, data_latency=2,
+                  response_latency=1, mshrs=8, tgts_per_mshr=20),
+        l2=Cache(size='1MB', assoc=16, tag_latency=12, data_latency=12,
+                 response_latency=5, mshrs=20, tgts_per_mshr=12),
+        dram=DDR4_2400_8x8(),
+        clk='2GHz',
+        mem_size='1GB',
+        fast_forward=fast_forward,
+    )
     
     # L2 prefetcher for better memory performance
-    system.l2cache.prefetcher = StridePrefetcher(degree=8, latency=1)
+    system.l2cache.prefetcher = L2_PREFETCHERS[l2_prefetcher]()
     
-    # Create memory bus
-    system.membus = SystemXBar()
-    system.membus.width = 64  # Wider bus for superscalar
-    
-    # Connect L1 caches to L2 cache
-    system.cpu.icache.mem_side = system.l2cache.cpu_side
-    system.cpu.dcache.mem_side = system.l2cache.cpu_side
-    
-    # Connect L2 cache to memory bus
-    system.l2cache.mem_side = system.membus.slave
-    
-    # Create interrupt controller
-    system.cpu.createInterruptController()
-    
-    # Connect special ports for x86
-    if buildEnv['TARGET_ISA'] == 'x86':
-        system.cpu.interrupts[0].pio = system.membus.master
-        system.cpu.interrupts[0].int_master = system.membus.slave
-        system.cpu.interrupts[0].int_slave = system.membus.master
-    
-    # Memory controller with higher bandwidth
-    system.mem_ctrl = MemCtrl()
-    system.mem_ctrl.dram = DDR4_2400_8x8()  # Faster memory
-    system.mem_ctrl.dram.range = system.mem_ranges[0]
-    system.mem_ctrl.port = system.membus.master
-    
-    # Connect system port
-    system.system_port = system.membus.slave
+    # Wider bus for superscalar
+    system.membus.width = 64
     
     return system
 
-def set_workload(system, binary_path):
-    """Set the workload/binary to execute"""
-    if not os.path.isfile(binary_path):
-        fatal(f"Binary file {binary_path} not found!")
-    
-    process = Process()
-    process.cmd = [binary_path]
-    system.cpu.workload = process
-    system.cpu.createThreads()
-
 def main():
     """Main simulation function"""
+    warn_if_slow_build()
+    
     parser = argparse.ArgumentParser(description='Superscalar Processor Simulation')
     parser.add_argument('binary', help='Path to binary executable')
     parser.add_argument('--output-dir', default='m5out', 
@@ -145,11 +124,16 @@ def main():
                        help='Issue width (instructions per cycle)')
     parser.add_argument('--rob-size', type=int, default=192,
                        help='Reorder buffer size')
+    parser.add_argument('--fast-forward', type=int, default=0,
+                       help='Instructions to run on AtomicSimpleCPU before switching to O3CPU')
+    parser.add_argument('--l2-prefetcher', choices=list(L2_PREFETCHERS), default='stride',
+                       help='L2 cache prefetcher')
     
     args = parser.parse_args()
     
     # Create superscalar system
-    system = create_superscalar_system(args.issue_width, args.rob_size)
+    system = create_superscalar_system(args.issue_width, args.rob_size, args.fast_forward,
+                                       args.l2_prefetcher)
     
     # Set workload
     set_workload(system, args.binary)
@@ -157,6 +141,9 @@ def main():
     # Create root object
     root = Root(full_system=False, system=system)
     
+    # Binary stats alongside stats.txt for faster analysis
+    add_hdf5_stats()
+    
     # Instantiate simulation
     m5.instantiate()
     
@@ -164,8 +151,13 @@ def main():
     print(f"Running workload: {args.binary}")
     print(f"Issue width: {args.issue_width} instructions/cycle")
     print(f"ROB size: {args.rob_size} entries")
+    print(f"L2 prefetcher: {args.l2_prefetcher}")
     print(f"Output directory: {args.output_dir}")
     
+    # Skip program startup and reset stats so only the detailed region is measured
+    if args.fast_forward:
+        run_fast_forward(system)
+    
     # Start simulation
     start_tick = m5.curTick()
     exit_event = m5.simulate()
@@ -64,8 +64,9 @@ install_gem5() {
     fi
     
     echo "Building gem5 (this may take 15-30 minutes)..."
-    # Use fewer parallel jobs to avoid memory issues
-    scons build/X86/gem5.opt -j$(( $(nproc) < 4 ? $(nproc) : 4 ))
+    # Use fewer parallel jobs to avoid memory issues; the .fast build drops
+    # assertions and tracing, which makes every simulation run quicker
+    scons build/X86/gem5.fast -j$(( $(nproc) < 4 ? $(nproc) : 4 ))
     
     echo "gem5 build completed successfully!"
 }
@@ -97,7 +98,7 @@ run_basic_pipeline() {
         local output_dir="$RESULTS_DIR/basic_pipeline/${workload}"
         mkdir -p "$output_dir"
         
-        ./build/X86/gem5.opt \
+        ./build/X86/gem5.fast \
             --outdir="$output_dir" \
             "$CONFIGS_DIR/basic_pipeline.py" \
             "$WORKLOADS_DIR/$workload"
@@ -115,6 +116,16 @@ import os
 import re
 import csv
 
+# Key metric patterns, compiled once as bytes so stats.txt is never decoded
+PATTERNS = {
+    'sim_seconds': re.compile(rb'sim_seconds\s+([\d\.]+)'),
+    'sim_insts': re.compile(rb'sim_insts\s+(\d+)'),
+    'host_inst_rate': re.compile(rb'host_inst_rate\s+([\d\.]+)'),
+    'system.cpu.committedInsts': re.compile(rb'system\.cpu\.committedInsts\s+(\d+)'),
+    'system.cpu.ipc': re.compile(rb'system\.cpu\.ipc\s+([\d\.]+)'),
+    'system.cpu.cycles': re.compile(rb'system\.cpu\.numCycles\s+(\d+)'),
+}
+
 def parse_stats_file(stats_path):
     """Parse gem5 stats.txt file and extract key metrics"""
     metrics = {}
@@ -122,26 +133,18 @@ def parse_stats_file(stats_path):
     if not os.path.exists(stats_path):
         return metrics
         
-    with open(stats_path, 'r') as f:
+    with open(stats_path, 'rb') as f:
         content = f.read()
         
-    # Extract key metrics using regex
-    patterns = {
-        'sim_seconds': r'sim_seconds\s+([\d\.]+)',
-        'sim_insts': r'sim_insts\s+(\d+)',
-        'host_inst_rate': r'host_inst_rate\s+([\d\.]+)',
-        'system.cpu.committedInsts': r'system\.cpu\.committedInsts\s+(\d+)',
-        'system.cpu.ipc': r'system\.cpu\.ipc\s+([\d\.]+)',
-        'system.cpu.cycles': r'system\.cpu\.numCycles\s+(\d+)',
-    }
-    
-    for metric, pattern in patterns.items():
-        match = re.search(pattern, content)
+    # Extract key metrics using regex; only the captured value is decoded
+    for metric, pattern in PATTERNS.items():
+        match = pattern.search(content)
         if match:
+            value = match.group(1).decode('ascii')
             try:
-                metrics[metric] = float(match.group(1))
+                metrics[metric] = float(value)
             except ValueError:
-                metrics[metric] = match.group(1)
+                metrics[metric] = value
     
     return metrics
 
@@ -249,6 +252,10 @@ case "${1:-all}" in
     "run")
         run_basic_pipeline
         ;;
+    "sweep")
+        # Every experiment and workload, one gem5 process per core
+        python3 "$PART2_DIR/sweep.py"
+        ;;
     "analyze")
         analyze_results
         ;;
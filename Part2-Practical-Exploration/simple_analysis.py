@@ -6,220 +6,290 @@ Analyzes gem5 simulation results without external dependencies
 """
 
 import os
+import io
+import sys
 import csv
 import json
+import pickle
+import argparse
 from pathlib import Path
 
-def analyze_performance_summary(csv_path):
-    """Analyze the performance summary CSV"""
-    print("="*60)
-    print("           ILP EXPERIMENT PERFORMANCE ANALYSIS")
-    print("="*60)
-    
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        data = list(reader)
-    
-    # Group by experiment type
+# Numeric columns of the performance summary and their types
+NUMERIC_COLUMNS = {
+    'IPC': float,
+    'Cycles': int,
+    'Cache_Hit_Rate': float,
+    'Branch_Accuracy': float,
+}
+
+def load_rows(csv_path):
+    """Read the summary CSV into {experiment: {column: [values]}}, numbers converted"""
     experiments = {}
-    for row in data:
-        exp_type = row['Experiment']
-        if exp_type not in experiments:
-            experiments[exp_type] = []
-        experiments[exp_type].append(row)
-    
+
+    with open(csv_path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        exp_index = header.index('Experiment')
+        columns = [(i, name, NUMERIC_COLUMNS.get(name, str))
+                   for i, name in enumerate(header) if i != exp_index]
+
+        for record in reader:
+            exp_type = record[exp_index]
+            exp_columns = experiments.get(exp_type)
+            if exp_columns is None:
+                exp_columns = experiments[exp_type] = {name: [] for _, name, _ in columns}
+
+            for i, name, convert in columns:
+                value = record[i]
+                exp_columns[name].append(convert(value) if value != '' else None)
+
+    return experiments
+
+def load_rows_cached(csv_path):
+    """load_rows() through a pickle next to the CSV, reused until the CSV changes"""
+    cache_path = csv_path.with_suffix('.pkl')
+
+    try:
+        if cache_path.stat().st_mtime_ns > csv_path.stat().st_mtime_ns:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+
+    experiments = load_rows(csv_path)
+
+    # A read-only results directory just means no cache next time
+    try:
+        with open(cache_path, 'wb') as f:
+            pickle.dump(experiments, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+
+    return experiments
+
+def compute_baselines(experiments):
+    """IPC per workload for the no-predictor and 1-way runs, shared by every analyzer"""
+    def baseline(exp_type, configuration):
+        data = experiments.get(exp_type)
+        if not data:
+            return {}
+        # Keep the first row for a repeated workload, as build_ipc_index does
+        result = {}
+        for config, workload, ipc in zip(data['Configuration'], data['Workload'], data['IPC']):
+            if config == configuration:
+                result.setdefault(workload, ipc)
+        return result
+
+    return {
+        'bp_none': baseline('Branch Prediction', 'none'),
+        'ss_1way': baseline('Superscalar', '1way'),
+    }
+
+def analyze_performance_summary(experiments, baselines, out):
+    """Analyze the performance summary"""
+    print("="*60, file=out)
+    print("           ILP EXPERIMENT PERFORMANCE ANALYSIS", file=out)
+    print("="*60, file=out)
+
     # Analyze each experiment
     for exp_type, exp_data in experiments.items():
-        print(f"\n{exp_type.upper()} EXPERIMENT RESULTS:")
-        print("-" * 50)
-        
+        print(f"\n{exp_type.upper()} EXPERIMENT RESULTS:", file=out)
+        print("-" * 50, file=out)
+
         if exp_type == "Basic Pipeline":
-            analyze_basic_pipeline(exp_data)
+            analyze_basic_pipeline(exp_data, out)
         elif exp_type == "Branch Prediction":
-            analyze_branch_prediction(exp_data)
+            analyze_branch_prediction(exp_data, baselines['bp_none'], out)
         elif exp_type == "Superscalar":
-            analyze_superscalar(exp_data)
+            analyze_superscalar(exp_data, baselines['ss_1way'], out)
+
+def group_by_configuration(data):
+    """Map each configuration to the row indices that use it"""
+    groups = {}
+    for i, config in enumerate(data['Configuration']):
+        groups.setdefault(config, []).append(i)
+    return groups
 
-def analyze_basic_pipeline(data):
+def analyze_basic_pipeline(data, out):
     """Analyze basic pipeline results"""
-    print("IPC Performance by Workload:")
-    
-    for row in data:
-        workload = row['Workload']
-        ipc = float(row['IPC'])
-        cycles = int(row['Cycles'])
-        cache_hit = float(row['Cache_Hit_Rate'])
-        
-        print(f"  {workload:15}: IPC={ipc:.4f}, Cycles={cycles:,}, Cache Hit={cache_hit:.1%}")
-    
+    print("IPC Performance by Workload:", file=out)
+
+    workloads = data['Workload']
+    ipcs = data['IPC']
+
+    for workload, ipc, cycles, cache_hit in zip(workloads, ipcs, data['Cycles'], data['Cache_Hit_Rate']):
+        print(f"  {workload:15}: IPC={ipc:.4f}, Cycles={cycles:,}, Cache Hit={cache_hit:.1%}", file=out)
+
     # Calculate averages
-    avg_ipc = sum(float(row['IPC']) for row in data) / len(data)
-    print(f"\nAverage IPC across all workloads: {avg_ipc:.4f}")
-    
+    avg_ipc = sum(ipcs) / len(ipcs)
+    print(f"\nAverage IPC across all workloads: {avg_ipc:.4f}", file=out)
+
     # Identify best/worst performing workloads
-    best = max(data, key=lambda x: float(x['IPC']))
-    worst = min(data, key=lambda x: float(x['IPC']))
-    print(f"Best performing: {best['Workload']} (IPC={float(best['IPC']):.4f})")
-    print(f"Worst performing: {worst['Workload']} (IPC={float(worst['IPC']):.4f})")
+    best = max(range(len(ipcs)), key=ipcs.__getitem__)
+    worst = min(range(len(ipcs)), key=ipcs.__getitem__)
+    print(f"Best performing: {workloads[best]} (IPC={ipcs[best]:.4f})", file=out)
+    print(f"Worst performing: {workloads[worst]} (IPC={ipcs[worst]:.4f})", file=out)
 
-def analyze_branch_prediction(data):
+def analyze_branch_prediction(data, baseline, out):
     """Analyze branch prediction results"""
+    workloads = data['Workload']
+    ipcs = data['IPC']
+    accuracies = data['Branch_Accuracy']
+
     # Group by predictor type
-    predictors = {}
-    for row in data:
-        pred = row['Configuration']
-        if pred not in predictors:
-            predictors[pred] = []
-        predictors[pred].append(row)
-    
-    print("Branch Prediction Performance Comparison:")
-    print("Predictor     | Workload        | IPC    | Branch Acc | Improvement")
-    print("-" * 65)
-    
-    # Calculate baseline (none predictor)
-    baseline = {row['Workload']: float(row['IPC']) for row in predictors.get('none', [])}
-    
-    for pred_type, pred_data in predictors.items():
-        for row in pred_data:
-            workload = row['Workload']
-            ipc = float(row['IPC'])
-            branch_acc = float(row['Branch_Accuracy'])
-            
-            if workload in baseline and baseline[workload] > 0:
-                improvement = ((ipc - baseline[workload]) / baseline[workload]) * 100
-            else:
-                improvement = 0
-            
-            print(f"{pred_type:12} | {workload:15} | {ipc:.4f} | {branch_acc:.1%}     | {improvement:+6.1f}%")
-    
+    predictors = group_by_configuration(data)
+
+    print("Branch Prediction Performance Comparison:", file=out)
+    print("Predictor     | Workload        | IPC    | Branch Acc | Improvement", file=out)
+    print("-" * 65, file=out)
+
+    # Every row's improvement over the baseline (none predictor)
+    base_ipcs = [baseline.get(workload, 0) for workload in workloads]
+    improvements = [((ipc - base) / base) * 100 if base > 0 else 0
+                    for ipc, base in zip(ipcs, base_ipcs)]
+
+    for pred_type, rows in predictors.items():
+        for i in rows:
+            print(f"{pred_type:12} | {workloads[i]:15} | {ipcs[i]:.4f} | {accuracies[i]:.1%}     | {improvements[i]:+6.1f}%", file=out)
+
     # Summary statistics
-    print("\nBranch Prediction Summary:")
-    for pred_type, pred_data in predictors.items():
-        avg_ipc = sum(float(row['IPC']) for row in pred_data) / len(pred_data)
-        avg_acc = sum(float(row['Branch_Accuracy']) for row in pred_data) / len(pred_data)
-        print(f"  {pred_type:12}: Avg IPC={avg_ipc:.4f}, Avg Accuracy={avg_acc:.1%}")
+    print("\nBranch Prediction Summary:", file=out)
+    for pred_type, rows in predictors.items():
+        avg_ipc = sum(ipcs[i] for i in rows) / len(rows)
+        avg_acc = sum(accuracies[i] for i in rows) / len(rows)
+        print(f"  {pred_type:12}: Avg IPC={avg_ipc:.4f}, Avg Accuracy={avg_acc:.1%}", file=out)
 
-def analyze_superscalar(data):
+def analyze_superscalar(data, baseline, out):
     """Analyze superscalar scaling results"""
-    # Group by issue width
-    issue_widths = {}
-    for row in data:
-        width = row['Configuration']
-        if width not in issue_widths:
-            issue_widths[width] = []
-        issue_widths[width].append(row)
-    
-    print("Superscalar Scaling Analysis:")
-    print("Issue Width | Workload        | IPC    | Efficiency | Scaling Factor")
-    print("-" * 70)
-    
-    # Calculate baseline (1-way)
-    baseline = {row['Workload']: float(row['IPC']) for row in issue_widths.get('1way', [])}
-    
-    for width, width_data in sorted(issue_widths.items(), key=lambda x: int(x[0][0])):
-        issue_num = int(width[0])
-        
-        for row in width_data:
-            workload = row['Workload']
-            ipc = float(row['IPC'])
-            efficiency = (ipc / issue_num) * 100
-            
-            if workload in baseline and baseline[workload] > 0:
-                scaling = ipc / baseline[workload]
-            else:
-                scaling = 1.0
-            
-            print(f"{width:11} | {workload:15} | {ipc:.4f} | {efficiency:8.1f}% | {scaling:8.2f}x")
-    
+    workloads = data['Workload']
+    ipcs = data['IPC']
+
+    # Group by issue width, parsing each label ('1way', '16way') to an int once
+    issue_widths = group_by_configuration(data)
+    issue_nums = {width: int(width.rstrip('way')) for width in issue_widths}
+
+    print("Superscalar Scaling Analysis:", file=out)
+    print("Issue Width | Workload        | IPC    | Efficiency | Scaling Factor", file=out)
+    print("-" * 70, file=out)
+
+    # Per-row efficiency and scaling over the baseline (1-way), computed once
+    widths = sorted(issue_widths, key=issue_nums.__getitem__)
+    efficiencies = [0.0] * len(ipcs)
+    scalings = [1.0] * len(ipcs)
+    by_width = {}
+
+    for width in widths:
+        issue_num = issue_nums[width]
+        for i in issue_widths[width]:
+            base = baseline.get(workloads[i], 0)
+            efficiencies[i] = (ipcs[i] / issue_num) * 100
+            if base > 0:
+                scalings[i] = ipcs[i] / base
+            by_width.setdefault((width, workloads[i]), i)
+
+            print(f"{width:11} | {workloads[i]:15} | {ipcs[i]:.4f} | {efficiencies[i]:8.1f}% | {scalings[i]:8.2f}x", file=out)
+
     # Scaling efficiency analysis
-    print("\nScaling Efficiency Summary:")
+    print("\nScaling Efficiency Summary:", file=out)
     for workload in baseline.keys():
-        print(f"\n{workload.upper()} Scaling:")
-        for width in sorted(issue_widths.keys(), key=lambda x: int(x[0])):
-            workload_data = next((row for row in issue_widths[width] if row['Workload'] == workload), None)
-            if workload_data:
-                issue_num = int(width[0])
-                ipc = float(workload_data['IPC'])
-                theoretical_max = issue_num
-                efficiency = (ipc / theoretical_max) * 100
-                scaling = ipc / baseline[workload] if baseline[workload] > 0 else 1.0
-                
-                print(f"  {width}: IPC={ipc:.3f}, Efficiency={efficiency:.1f}%, Scaling={scaling:.2f}x")
-
-def generate_insights(csv_path):
+        print(f"\n{workload.upper()} Scaling:", file=out)
+        for width in widths:
+            i = by_width.get((width, workload))
+            if i is not None:
+                print(f"  {width}: IPC={ipcs[i]:.3f}, Efficiency={efficiencies[i]:.1f}%, Scaling={scalings[i]:.2f}x", file=out)
+
+def build_ipc_index(experiments):
+    """Map (Experiment, Configuration, Workload) to IPC, keeping the first row"""
+    index = {}
+    for exp_type, data in experiments.items():
+        for config, workload, ipc in zip(data['Configuration'], data['Workload'], data['IPC']):
+            index.setdefault((exp_type, config, workload), ipc)
+    return index
+
+def generate_insights(experiments, baselines, out):
     """Generate key insights from the analysis"""
-    print("\n" + "="*60)
-    print("                    KEY INSIGHTS")
-    print("="*60)
-    
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        data = list(reader)
-    
+    print("\n" + "="*60, file=out)
+    print("                    KEY INSIGHTS", file=out)
+    print("="*60, file=out)
+
+    idx = build_ipc_index(experiments)
+
     # Find best overall performance
-    best_overall = max(data, key=lambda x: float(x['IPC']))
-    print(f"Best Overall Performance: {float(best_overall['IPC']):.4f} IPC")
-    print(f"  Configuration: {best_overall['Experiment']} - {best_overall['Configuration']}")
-    print(f"  Workload: {best_overall['Workload']}")
-    
+    best_exp, best_i = max(
+        ((exp_type, i) for exp_type, data in experiments.items() for i in range(len(data['IPC']))),
+        key=lambda item: experiments[item[0]]['IPC'][item[1]])
+    best_data = experiments[best_exp]
+    print(f"Best Overall Performance: {best_data['IPC'][best_i]:.4f} IPC", file=out)
+    print(f"  Configuration: {best_exp} - {best_data['Configuration'][best_i]}", file=out)
+    print(f"  Workload: {best_data['Workload'][best_i]}", file=out)
+
     # Branch prediction effectiveness
-    bp_data = [row for row in data if row['Experiment'] == 'Branch Prediction']
-    if bp_data:
-        tournament_data = [row for row in bp_data if row['Configuration'] == 'tournament']
-        none_data = [row for row in bp_data if row['Configuration'] == 'none']
-        
-        if tournament_data and none_data:
-            branch_intensive_tournament = next((row for row in tournament_data if row['Workload'] == 'branch_intensive'), None)
-            branch_intensive_none = next((row for row in none_data if row['Workload'] == 'branch_intensive'), None)
-            
-            if branch_intensive_tournament and branch_intensive_none:
-                improvement = ((float(branch_intensive_tournament['IPC']) - float(branch_intensive_none['IPC'])) / 
-                              float(branch_intensive_none['IPC'])) * 100
-                print(f"\nBranch Prediction Impact:")
-                print(f"  Tournament vs No Prediction: {improvement:.1f}% IPC improvement")
-                print(f"  On branch-intensive workload: {float(branch_intensive_none['IPC']):.3f} → {float(branch_intensive_tournament['IPC']):.3f} IPC")
-    
+    tournament_ipc = idx.get(('Branch Prediction', 'tournament', 'branch_intensive'))
+    none_ipc = baselines['bp_none'].get('branch_intensive')
+
+    if tournament_ipc is not None and none_ipc is not None:
+        improvement = ((tournament_ipc - none_ipc) / none_ipc) * 100
+        print(f"\nBranch Prediction Impact:", file=out)
+        print(f"  Tournament vs No Prediction: {improvement:.1f}% IPC improvement", file=out)
+        print(f"  On branch-intensive workload: {none_ipc:.3f} → {tournament_ipc:.3f} IPC", file=out)
+
     # Superscalar scaling limits
-    ss_data = [row for row in data if row['Experiment'] == 'Superscalar']
-    if ss_data:
-        parallel_8way = next((row for row in ss_data if row['Configuration'] == '8way' and row['Workload'] == 'parallel_workload'), None)
-        if parallel_8way:
-            ipc_8way = float(parallel_8way['IPC'])
-            efficiency_8way = (ipc_8way / 8) * 100
-            print(f"\nSuperscalar Scaling:")
-            print(f"  8-way parallel workload: {ipc_8way:.3f} IPC ({efficiency_8way:.1f}% efficiency)")
-            print(f"  Diminishing returns evident beyond 4-way issue")
-    
+    ipc_8way = idx.get(('Superscalar', '8way', 'parallel_workload'))
+    if ipc_8way is not None:
+        efficiency_8way = (ipc_8way / 8) * 100
+        print(f"\nSuperscalar Scaling:", file=out)
+        print(f"  8-way parallel workload: {ipc_8way:.3f} IPC ({efficiency_8way:.1f}% efficiency)", file=out)
+        print(f"  Diminishing returns evident beyond 4-way issue", file=out)
+
     # Workload characteristics
-    print(f"\nWorkload Characteristics:")
+    print(f"\nWorkload Characteristics:", file=out)
+    totals = {}
+    for data in experiments.values():
+        for workload, ipc in zip(data['Workload'], data['IPC']):
+            total = totals.setdefault(workload, [0.0, 0])
+            total[0] += ipc
+            total[1] += 1
+
     workload_performance = {}
     for workload in ['simple_loop', 'branch_intensive', 'parallel_workload']:
-        workload_data = [row for row in data if row['Workload'] == workload]
-        if workload_data:
-            avg_ipc = sum(float(row['IPC']) for row in workload_data) / len(workload_data)
-            workload_performance[workload] = avg_ipc
-    
+        if workload in totals:
+            ipc_sum, count = totals[workload]
+            workload_performance[workload] = ipc_sum / count
+
     for workload, avg_ipc in sorted(workload_performance.items(), key=lambda x: x[1], reverse=True):
-        print(f"  {workload:15}: Average IPC = {avg_ipc:.3f}")
+        print(f"  {workload:15}: Average IPC = {avg_ipc:.3f}", file=out)
 
 def main():
     """Main analysis function"""
-    results_dir = Path("/Users/L040929/Documents/University of Cumberlands/MSCS-531-M50/Assignment-4/Part2-Practical-Exploration/results")
-    csv_path = results_dir / "performance_summary.csv"
-    
+    parser = argparse.ArgumentParser(description='Summarize ILP experiment results')
+    parser.add_argument('--results-dir', type=Path, default=Path(__file__).resolve().parent / 'results',
+                       help='Directory containing performance_summary.csv')
+
+    args = parser.parse_args()
+
+    csv_path = args.results_dir / "performance_summary.csv"
+
     if not csv_path.exists():
         print(f"Error: Performance summary file not found: {csv_path}")
         return 1
-    
-    # Run analysis
-    analyze_performance_summary(csv_path)
-    generate_insights(csv_path)
-    
-    print("\n" + "="*60)
-    print("Analysis complete! Results can be used to populate the final report.")
-    print(f"Data source: {csv_path}")
-    print("="*60)
-    
+
+    # Read the CSV once (or reuse the cached parse) and share it between both passes
+    experiments = load_rows_cached(csv_path)
+    baselines = compute_baselines(experiments)
+
+    # Run analysis, building the whole report before writing it out at once
+    out = io.StringIO()
+    analyze_performance_summary(experiments, baselines, out)
+    generate_insights(experiments, baselines, out)
+
+    print("\n" + "="*60, file=out)
+    print("Analysis complete! Results can be used to populate the final report.", file=out)
+    print(f"Data source: {csv_path}", file=out)
+    print("="*60, file=out)
+
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
+
     return 0
 
 if __name__ == '__main__':
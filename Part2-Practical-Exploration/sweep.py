@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+"""
+gem5 ILP Experiment Sweep
+Runs every (configuration x workload) simulation, one gem5 process per core
+"""
+
+import os
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import product
+from pathlib import Path
+
+PART2_DIR = Path(__file__).resolve().parent
+CONFIGS_DIR = PART2_DIR / 'gem5-configs'
+WORKLOADS_DIR = PART2_DIR / 'workloads'
+
+WORKLOADS = ['simple_loop', 'branch_intensive', 'parallel_workload']
+BRANCH_PREDICTORS = ['none', 'local', 'bimode', 'tournament', 'tage']
+ISSUE_WIDTHS = [1, 2, 4, 8]
+
+def build_jobs(results_dir, experiments):
+    """List (output_dir, config_script, config_flags, binary) for each simulation"""
+    jobs = []
+
+    if 'basic_pipeline' in experiments:
+        for workload in WORKLOADS:
+            jobs.append((results_dir / 'basic_pipeline' / workload,
+                         'basic_pipeline.py', [], workload))
+
+    if 'branch_prediction' in experiments:
+        for predictor, workload in product(BRANCH_PREDICTORS, WORKLOADS):
+            jobs.append((results_dir / 'branch_prediction' / f'{predictor}_{workload}',
+                         'branch_prediction.py', ['--branch-pred', predictor], workload))
+
+    if 'superscalar' in experiments:
+        for width, workload in product(ISSUE_WIDTHS, WORKLOADS):
+            jobs.append((results_dir / 'superscalar' / f'{width}way_{workload}',
+                         'superscalar.py', ['--issue-width', str(width)], workload))
+
+    return jobs
+
+def run_one(gem5, job):
+    """Run one gem5 simulation into its own output directory"""
+    output_dir, config, flags, workload = job
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Every job gets a separate --outdir so stats.txt never collides
+    cmd = [str(gem5), f'--outdir={output_dir}', str(CONFIGS_DIR / config),
+           str(WORKLOADS_DIR / workload), *flags]
+    with open(output_dir / 'sweep.log', 'w') as log:
+        result = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT)
+
+    return output_dir, result.returncode
+
+def main():
+    """Main sweep function"""
+    parser = argparse.ArgumentParser(description='Run the gem5 ILP experiment sweep in parallel')
+    parser.add_argument('--gem5', type=Path,
+                       default=PART2_DIR / 'gem5' / 'build' / 'X86' / 'gem5.fast',
+                       help='gem5 binary to run')
+    parser.add_argument('--results-dir', type=Path, default=PART2_DIR / 'results',
+                       help='Directory to write per-run outputs into')
+    parser.add_argument('--experiments', nargs='+',
+                       choices=['basic_pipeline', 'branch_prediction', 'superscalar'],
+                       default=['basic_pipeline', 'branch_prediction', 'superscalar'],
+                       help='Experiments to run')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                       help='Simulations to run at once')
+
+    args = parser.parse_args()
+
+    if not args.gem5.is_file():
+        print(f"Error: gem5 binary not found: {args.gem5}")
+        return 1
+
+    jobs = build_jobs(args.results_dir, args.experiments)
+    print(f"Running {len(jobs)} simulations, {args.jobs} at a time")
+
+    # Each simulation is its own single-threaded gem5 process; the pool threads
+    # only wait on them, so nothing of the m5 runtime is shared between jobs
+    failures = 0
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        futures = [executor.submit(run_one, args.gem5, job) for job in jobs]
+        for future in as_completed(futures):
+            output_dir, returncode = future.result()
+            status = 'ok' if returncode == 0 else f'failed ({returncode})'
+            print(f"  {output_dir.relative_to(args.results_dir)}: {status}")
+            failures += returncode != 0
+
+    print(f"\nSweep complete: {len(jobs) - failures}/{len(jobs)} simulations succeeded")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    exit(main())